@@ -0,0 +1,67 @@
+"""Constants and helpers shared by the schema scripts in script/python."""
+
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    # Optional: faster JSON parsing/serialization, stdlib json is used otherwise
+    orjson = None
+
+# HTTP methods that denote an operation in an OpenAPI path item
+HTTP_METHODS = frozenset({"get", "put", "post", "delete", "options", "head", "patch", "trace"})
+
+
+@contextmanager
+def atomic_open(path: Path, mode: str = "wb", **kwargs):
+    """
+    Open a temp file next to path and move it over path once the block completes.
+    If the block raises (including KeyboardInterrupt), the temp file is removed
+    and path is left as it was.
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp, mode, **kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write data to path so readers see either the old file or the complete new one."""
+    with atomic_open(path) as f:
+        f.write(data)
+
+
+def loads(data: bytes) -> Any:
+    """
+    Parse a JSON document from raw bytes, using orjson when available.
+    Both parsers raise a json.JSONDecodeError subclass on invalid input.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_json(path: Path) -> Any:
+    """Parse a JSON file from its raw bytes."""
+    return loads(path.read_bytes())
+
+
+def write_json(path: Path, data: Any) -> None:
+    """Atomically write data to path as UTF-8 JSON indented by 2 spaces."""
+    if orjson is not None:
+        # OPT_NON_STR_KEYS stringifies int/float keys the way json.dump does
+        atomic_write_bytes(path, orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        # json.dump streams encoded chunks into the file instead of building one big str
+        with atomic_open(path, "w", encoding="utf-8", buffering=1 << 16) as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
@@ -16,30 +16,89 @@ Usage:
 """
 
 import argparse
+import io
 import json
+import mmap
+import os
 import re
+import shutil
 import sys
 from collections import defaultdict
-from dataclasses import dataclass, asdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Dict, Iterator, List, Sequence, Set, TextIO, Tuple
 from datetime import datetime
+from html import escape
+from itertools import repeat
 
-@dataclass
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Pattern to match @apiOperation:{operationId} tags (matched on raw bytes, no decode)
+_OP_TAG_RE = re.compile(rb'@apiOperation:([A-Za-z0-9_]+)')
+
+# Shared tags value for operations without tags, instead of an empty list per op
+_EMPTY_TAGS: Tuple[str, ...] = ()
+
+# Method badge markup for the standard HTTP methods, built once
+_METHOD_BADGE = {
+    m: f'<span class="method {m}">{m}</span>'
+    for m in ('GET', 'POST', 'PUT', 'PATCH', 'DELETE')
+}
+
+# Below this many feature files the process pool costs more than it saves
+_PARALLEL_SCAN_MIN_FILES = 32
+
+
+@dataclass(slots=True)
 class EndpointInfo:
     """Information about an API endpoint."""
     operation_id: str
     path: str
     method: str
     summary: str = ""
-    tags: List[str] = None
+    tags: Sequence[str] = ()
 
     def __post_init__(self):
         if self.tags is None:
-            self.tags = []
+            self.tags = _EMPTY_TAGS
+
+
+def _dumps_json(data) -> str:
+    """Pretty-print data as JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def _status(percentage: float) -> str:
+    """Get status emoji based on coverage percentage."""
+    return "🟢" if percentage >= 80 else "🟡" if percentage >= 60 else "🔴"
 
 
-@dataclass
+def _method_badge(method: str) -> str:
+    """Return the HTML badge for an HTTP method."""
+    badge = _METHOD_BADGE.get(method)
+    if badge is None:
+        badge = f'<span class="method {escape(method)}">{escape(method)}</span>'
+    return badge
+
+
+def _op_to_dict(op: EndpointInfo) -> dict:
+    """Serialize an EndpointInfo without the recursive copying done by dataclasses.asdict."""
+    return {
+        'operation_id': op.operation_id,
+        'path': op.path,
+        'method': op.method,
+        'summary': op.summary,
+        'tags': op.tags
+    }
+
+
+@dataclass(slots=True)
 class CoverageReport:
     """Complete coverage report data."""
     total_endpoints: int
@@ -48,6 +107,7 @@ class CoverageReport:
     coverage_percentage: float
     covered_operations: List[EndpointInfo]
     uncovered_operations: List[EndpointInfo]
+    covered_files: List[List[str]]  # feature files per covered operation, parallel to covered_operations
     coverage_by_tag: Dict[str, dict]
     coverage_by_method: Dict[str, dict]
 
@@ -62,8 +122,11 @@ class OpenAPIParser:
     def _load_schema(self) -> dict:
         """Load OpenAPI schema from JSON file."""
         try:
-            with open(self.schema_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(self.schema_path, 'rb') as f:
+                data = f.read()
+            if orjson is not None:
+                return orjson.loads(data)
+            return json.loads(data)
         except FileNotFoundError:
             print(f"✗ Schema file not found: {self.schema_path}", file=sys.stderr)
             print(f"  Run: python script/python/fetch_openapi_schema.py", file=sys.stderr)
@@ -107,7 +170,7 @@ class OpenAPIParser:
             path = spec.get("path")
             method = spec.get("method", "").upper()
             summary = item.get("description", "")
-            tags = item.get("tags", [])
+            tags = item.get("tags") or _EMPTY_TAGS
             
             if not operation_id:
                 continue  # skip malformed entries
@@ -132,6 +195,8 @@ class FeatureFileParser:
 
     def __init__(self, features_dir: Path):
         self.features_dir = features_dir
+        # Reported paths are relative to three levels above the features dir
+        self._rel_base = os.path.join(str(features_dir.parent.parent.parent), '')
 
     def extract_operation_tags(self) -> Dict[str, List[str]]:
         """
@@ -141,26 +206,78 @@ class FeatureFileParser:
             Dict mapping operationId to list of feature files that test it
         """
         operation_tags = defaultdict(list)
-        feature_files = list(self.features_dir.rglob('*.feature'))
-
-        # Pattern to match @apiOperation:{operationId} tags
-        op_tag_pattern = re.compile(r'@apiOperation:(\w+)')
+        feature_files = list(_iter_feature_files(str(self.features_dir)))
+        # map() stops at the shortest iterable, so one repeated base covers every file
+        rel_bases = repeat(self._rel_base)
 
-        for feature_file in feature_files:
-            try:
-                with open(feature_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    matches = op_tag_pattern.findall(content)
-
-                    for operation_id in matches:
-                        relative_path = feature_file.relative_to(self.features_dir.parent.parent.parent)
-                        operation_tags[operation_id].append(str(relative_path))
-
-            except Exception as e:
-                print(f"Warning: Could not read {feature_file}: {e}", file=sys.stderr)
+        if len(feature_files) < _PARALLEL_SCAN_MIN_FILES:
+            results = map(_scan_one, feature_files, rel_bases)
+            self._merge(operation_tags, results)
+        else:
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                results = executor.map(_scan_one, feature_files, rel_bases, chunksize=16)
+                self._merge(operation_tags, results)
 
         return dict(operation_tags)
 
+    @staticmethod
+    def _merge(operation_tags: Dict[str, List[str]], results) -> None:
+        """Fold per-file scan results into the operationId -> files mapping."""
+        for operation_ids, relative_path in results:
+            for operation_id in operation_ids:
+                operation_tags[operation_id].append(relative_path)
+
+
+def _iter_feature_files(root: str) -> Iterator[str]:
+    """
+    Yield paths of all *.feature files under root.
+
+    Walks with os.scandir and plain strings rather than Path.rglob, which
+    builds a Path object for every directory and file it visits. Files come
+    out in the same order rglob produced: a directory's own files first, then
+    its subdirectories depth-first in scandir order.
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.name.endswith('.feature'):
+                        yield entry.path
+        except OSError:
+            continue
+        # Reversed so the first subdirectory is popped (visited) first
+        stack.extend(reversed(subdirs))
+
+
+def _scan_one(feature_file: str, rel_base: str) -> Tuple[List[str], str]:
+    """
+    Scan a single feature file for @apiOperation tags.
+
+    Kept at module level so it can be pickled into ProcessPoolExecutor workers.
+
+    Returns:
+        Tuple of (operationIds found in order, file path with the rel_base prefix removed)
+    """
+    operation_ids = []
+    try:
+        # mmap refuses empty files, and they can't hold tags anyway
+        if os.path.getsize(feature_file) > 0:
+            with open(feature_file, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    for match in _OP_TAG_RE.finditer(mm):
+                        operation_ids.append(match.group(1).decode('ascii'))
+    except Exception as e:
+        print(f"Warning: Could not read {feature_file}: {e}", file=sys.stderr)
+
+    if feature_file.startswith(rel_base):
+        return operation_ids, feature_file[len(rel_base):]
+    return operation_ids, feature_file
+
 
 class CoverageAnalyzer:
     """Analyze API test coverage."""
@@ -168,18 +285,41 @@ class CoverageAnalyzer:
     def __init__(self, operations: List[EndpointInfo], operation_tags: Dict[str, List[str]]):
         self.operations = operations
         self.operation_tags = operation_tags
+        # Only the keys matter for classification; build the set once
+        self._tagged_ids = frozenset(operation_tags)
 
     def analyze(self) -> CoverageReport:
-        """Perform coverage analysis."""
+        """Perform coverage analysis in a single pass over the operations."""
         covered_ops = []
         uncovered_ops = []
+        # group -> [total, covered]; turned into report dicts by _finalize_stats
+        tag_stats: Dict[str, List[int]] = {}
+        method_stats: Dict[str, List[int]] = {}
 
         for op in self.operations:
-            if op.operation_id in self.operation_tags:
+            is_covered = op.operation_id in self._tagged_ids
+            if is_covered:
                 covered_ops.append(op)
             else:
                 uncovered_ops.append(op)
 
+            counts = method_stats.get(op.method)
+            if counts is None:
+                counts = method_stats[op.method] = [0, 0]
+            counts[0] += 1
+            counts[1] += is_covered
+            for tag in op.tags:
+                counts = tag_stats.get(tag)
+                if counts is None:
+                    counts = tag_stats[tag] = [0, 0]
+                counts[0] += 1
+                counts[1] += is_covered
+
+        # Formatters list endpoints by operationId, so sort once here
+        covered_ops.sort(key=lambda x: x.operation_id)
+        uncovered_ops.sort(key=lambda x: x.operation_id)
+        covered_files = [self.operation_tags[op.operation_id] for op in covered_ops]
+
         total = len(self.operations)
         covered = len(covered_ops)
         coverage_pct = (covered / total * 100) if total > 0 else 0
@@ -191,55 +331,24 @@ class CoverageAnalyzer:
             coverage_percentage=coverage_pct,
             covered_operations=covered_ops,
             uncovered_operations=uncovered_ops,
-            coverage_by_tag=self._calculate_coverage_by_tag(covered_ops, uncovered_ops),
-            coverage_by_method=self._calculate_coverage_by_method(covered_ops, uncovered_ops)
+            covered_files=covered_files,
+            coverage_by_tag=self._finalize_stats(tag_stats),
+            coverage_by_method=self._finalize_stats(method_stats)
         )
 
-    def _calculate_coverage_by_tag(self, covered: List[EndpointInfo], uncovered: List[EndpointInfo]) -> Dict[str, dict]:
-        """Calculate coverage grouped by API tags."""
-        tag_stats = defaultdict(lambda: {'total': 0, 'covered': 0})
-
-        for op in covered + uncovered:
-            is_covered = op in covered
-            for tag in op.tags:
-                tag_stats[tag]['total'] += 1
-                if is_covered:
-                    tag_stats[tag]['covered'] += 1
-
-        # Calculate percentages and status emoji
-        for tag, stats in tag_stats.items():
-            stats['percentage'] = (stats['covered'] / stats['total'] * 100) if stats['total'] > 0 else 0
-            stats['status'] = self._get_status_emoji(stats['percentage'])
-
-        return dict(tag_stats)
-
-    def _calculate_coverage_by_method(self, covered: List[EndpointInfo], uncovered: List[EndpointInfo]) -> Dict[str, dict]:
-        """Calculate coverage grouped by HTTP method."""
-        method_stats = defaultdict(lambda: {'total': 0, 'covered': 0})
-
-        for op in covered:
-            method_stats[op.method]['total'] += 1
-            method_stats[op.method]['covered'] += 1
-
-        for op in uncovered:
-            method_stats[op.method]['total'] += 1
-
-        # Calculate percentages and status emoji
-        for method, stats in method_stats.items():
-            stats['percentage'] = (stats['covered'] / stats['total'] * 100) if stats['total'] > 0 else 0
-            stats['status'] = self._get_status_emoji(stats['percentage'])
-
-        return dict(method_stats)
-
     @staticmethod
-    def _get_status_emoji(percentage: float) -> str:
-        """Get status emoji based on coverage percentage."""
-        if percentage >= 80:
-            return "🟢"
-        elif percentage >= 60:
-            return "🟡"
-        else:
-            return "🔴"
+    def _finalize_stats(group_stats: Dict[str, List[int]]) -> Dict[str, dict]:
+        """Build tag/method coverage entries with percentage and status emoji."""
+        # Groups only exist once an operation was counted, so total is never zero
+        return {
+            group: {
+                'total': total,
+                'covered': covered,
+                'percentage': (percentage := covered / total * 100),
+                'status': _status(percentage),
+            }
+            for group, (total, covered) in group_stats.items()
+        }
 
 
 class ReportFormatter:
@@ -305,8 +414,7 @@ class ReportFormatter:
         lines.append(f"COVERED ENDPOINTS ({len(report.covered_operations)} total)")
         lines.append("-" * 80)
         if report.covered_operations:
-            for op in sorted(report.covered_operations, key=lambda x: x.operation_id)[:20]:
-                feature_files = operation_tags.get(op.operation_id, [])
+            for op, feature_files in zip(report.covered_operations[:20], report.covered_files):
                 lines.append(f"  ✓ {op.operation_id} ({op.method} {op.path})")
                 for f in feature_files[:3]:  # Show first 3 files
                     lines.append(f"      → {f}")
@@ -336,19 +444,26 @@ class ReportFormatter:
             'coverage_by_tag': report.coverage_by_tag,
             'covered_operations': [
                 {
-                    **asdict(op),
-                    'tested_in_files': operation_tags.get(op.operation_id, [])
+                    **_op_to_dict(op),
+                    'tested_in_files': feature_files
                 }
-                for op in report.covered_operations
+                for op, feature_files in zip(report.covered_operations, report.covered_files)
             ],
-            'uncovered_operations': [asdict(op) for op in report.uncovered_operations]
+            'uncovered_operations': [_op_to_dict(op) for op in report.uncovered_operations]
         }
-        return json.dumps(data, indent=2, ensure_ascii=False)
+        return _dumps_json(data)
 
     @staticmethod
     def format_html(report: CoverageReport, operation_tags: Dict[str, List[str]]) -> str:
         """Format report as HTML."""
-        html = f"""<!DOCTYPE html>
+        buffer = io.StringIO()
+        ReportFormatter.format_html_to(buffer, report, operation_tags)
+        return buffer.getvalue()
+
+    @staticmethod
+    def format_html_to(sink: TextIO, report: CoverageReport, operation_tags: Dict[str, List[str]]) -> None:
+        """Write report as HTML to sink fragment by fragment."""
+        sink.write(f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -541,20 +656,20 @@ class ReportFormatter:
                 </tr>
             </thead>
             <tbody>
-"""
+""")
         for method in sorted(report.coverage_by_method.keys()):
             stats = report.coverage_by_method[method]
-            html += f"""
+            sink.write(f"""
                 <tr>
                     <td>{stats['status']}</td>
-                    <td><span class="method {method}">{method}</span></td>
+                    <td>{_method_badge(method)}</td>
                     <td>{stats['total']}</td>
                     <td>{stats['covered']}</td>
                     <td>{stats['total'] - stats['covered']}</td>
                     <td>{stats['percentage']:.1f}%</td>
                 </tr>
-"""
-        html += """
+""")
+        sink.write("""
             </tbody>
         </table>
 
@@ -571,20 +686,20 @@ class ReportFormatter:
                 </tr>
             </thead>
             <tbody>
-"""
+""")
         sorted_tags = sorted(report.coverage_by_tag.items(), key=lambda x: x[1]['percentage'], reverse=True)
         for tag, stats in sorted_tags:
-            html += f"""
+            sink.write(f"""
                 <tr>
                     <td>{stats['status']}</td>
-                    <td><span class="tag">{tag}</span></td>
+                    <td><span class="tag">{escape(tag)}</span></td>
                     <td>{stats['total']}</td>
                     <td>{stats['covered']}</td>
                     <td>{stats['total'] - stats['covered']}</td>
                     <td>{stats['percentage']:.1f}%</td>
                 </tr>
-"""
-        html += """
+""")
+        sink.write("""
             </tbody>
         </table>
 
@@ -599,18 +714,18 @@ class ReportFormatter:
                 </tr>
             </thead>
             <tbody>
-"""
-        for op in sorted(report.uncovered_operations, key=lambda x: x.operation_id):
-            tags_html = ''.join([f'<span class="tag">{tag}</span>' for tag in op.tags])
-            html += f"""
+""")
+        for op in report.uncovered_operations:
+            tags_html = ''.join([f'<span class="tag">{escape(tag)}</span>' for tag in op.tags])
+            sink.write(f"""
                 <tr>
-                    <td><span class="uncovered-icon">✗</span> {op.operation_id}</td>
-                    <td><span class="method {op.method}">{op.method}</span></td>
-                    <td><code>{op.path}</code></td>
+                    <td><span class="uncovered-icon">✗</span> {escape(op.operation_id)}</td>
+                    <td>{_method_badge(op.method)}</td>
+                    <td><code>{escape(str(op.path))}</code></td>
                     <td>{tags_html}</td>
                 </tr>
-"""
-        html += """
+""")
+        sink.write("""
             </tbody>
         </table>
 
@@ -625,102 +740,116 @@ class ReportFormatter:
                 </tr>
             </thead>
             <tbody>
-"""
-        for op in sorted(report.covered_operations, key=lambda x: x.operation_id):
-            feature_files = operation_tags.get(op.operation_id, [])
-            files_html = '<br>'.join([f'<span class="file-link">→ {f}</span>' for f in feature_files[:5]])
+""")
+        for op, feature_files in zip(report.covered_operations, report.covered_files):
+            files_html = '<br>'.join([f'<span class="file-link">→ {escape(f)}</span>' for f in feature_files[:5]])
             if len(feature_files) > 5:
                 files_html += f'<br><span class="file-link">... and {len(feature_files) - 5} more</span>'
 
-            html += f"""
+            sink.write(f"""
                 <tr>
-                    <td><span class="covered-icon">✓</span> {op.operation_id}</td>
-                    <td><span class="method {op.method}">{op.method}</span></td>
-                    <td><code>{op.path}</code></td>
+                    <td><span class="covered-icon">✓</span> {escape(op.operation_id)}</td>
+                    <td>{_method_badge(op.method)}</td>
+                    <td><code>{escape(str(op.path))}</code></td>
                     <td>{files_html}</td>
                 </tr>
-"""
-        html += """
+""")
+        sink.write("""
             </tbody>
         </table>
     </div>
 </body>
 </html>
-"""
-        return html
+""")
 
     @staticmethod
     def format_markdown(report: CoverageReport, operation_tags: Dict[str, List[str]]) -> str:
         """Format report as Markdown."""
-        lines = []
-        lines.append("# API Endpoint Coverage Report")
-        lines.append("")
+        buffer = io.StringIO()
+        ReportFormatter.format_markdown_to(buffer, report, operation_tags)
+        return buffer.getvalue()
+
+    @staticmethod
+    def format_markdown_to(sink: TextIO, report: CoverageReport, operation_tags: Dict[str, List[str]]) -> None:
+        """Write report as Markdown to sink line by line."""
+        def writeln(line: str = "") -> None:
+            sink.write(line)
+            sink.write("\n")
+
+        writeln("# API Endpoint Coverage Report")
+        writeln()
 
         # Summary with badges
-        coverage_badge = "🟢" if report.coverage_percentage >= 80 else "🟡" if report.coverage_percentage >= 60 else "🔴"
-        lines.append(f"{coverage_badge} **Coverage: {report.coverage_percentage:.2f}%**")
-        lines.append("")
+        coverage_badge = _status(report.coverage_percentage)
+        writeln(f"{coverage_badge} **Coverage: {report.coverage_percentage:.2f}%**")
+        writeln()
 
         # Color Legend
-        lines.append("## Coverage Status Legend")
-        lines.append("")
-        lines.append("| Status | Threshold | Description |")
-        lines.append("|--------|-----------|-------------|")
-        lines.append("| 🟢 Green | ≥ 80% | Good coverage |")
-        lines.append("| 🟡 Yellow | ≥ 60% | Needs improvement |")
-        lines.append("| 🔴 Red | < 60% | Critical - needs attention |")
-        lines.append("")
-
-        lines.append("## Summary")
-        lines.append("")
-        lines.append("| Metric | Count |")
-        lines.append("|--------|------:|")
-        lines.append(f"| Total Endpoints | {report.total_endpoints} |")
-        lines.append(f"| Covered Endpoints | {report.covered_endpoints} |")
-        lines.append(f"| Uncovered Endpoints | {report.uncovered_endpoints} |")
-        lines.append(f"| **Coverage Percentage** | **{coverage_badge} {report.coverage_percentage:.2f}%** |")
-        lines.append("")
+        writeln("## Coverage Status Legend")
+        writeln()
+        writeln("| Status | Threshold | Description |")
+        writeln("|--------|-----------|-------------|")
+        writeln("| 🟢 Green | ≥ 80% | Good coverage |")
+        writeln("| 🟡 Yellow | ≥ 60% | Needs improvement |")
+        writeln("| 🔴 Red | < 60% | Critical - needs attention |")
+        writeln()
+
+        writeln("## Summary")
+        writeln()
+        writeln("| Metric | Count |")
+        writeln("|--------|------:|")
+        writeln(f"| Total Endpoints | {report.total_endpoints} |")
+        writeln(f"| Covered Endpoints | {report.covered_endpoints} |")
+        writeln(f"| Uncovered Endpoints | {report.uncovered_endpoints} |")
+        writeln(f"| **Coverage Percentage** | **{coverage_badge} {report.coverage_percentage:.2f}%** |")
+        writeln()
 
         # Coverage by HTTP Method
         if report.coverage_by_method:
-            lines.append("## Coverage by HTTP Method")
-            lines.append("")
-            lines.append("| Method | Covered | Total | Percentage |")
-            lines.append("|--------|--------:|------:|-----------:|")
+            writeln("## Coverage by HTTP Method")
+            writeln()
+            writeln("| Method | Covered | Total | Percentage |")
+            writeln("|--------|--------:|------:|-----------:|")
             for method in sorted(report.coverage_by_method.keys()):
                 stats = report.coverage_by_method[method]
-                lines.append(f"| {stats['status']} {method} | {stats['covered']} | {stats['total']} | {stats['percentage']:.1f}% |")
-            lines.append("")
+                writeln(f"| {stats['status']} {method} | {stats['covered']} | {stats['total']} | {stats['percentage']:.1f}% |")
+            writeln()
 
         # Coverage by API Tag
         if report.coverage_by_tag:
-            lines.append("## Coverage by API Tag")
-            lines.append("")
-            lines.append("| Tag | Covered | Total | Percentage |")
-            lines.append("|-----|--------:|------:|-----------:|")
+            writeln("## Coverage by API Tag")
+            writeln()
+            writeln("| Tag | Covered | Total | Percentage |")
+            writeln("|-----|--------:|------:|-----------:|")
             sorted_tags = sorted(report.coverage_by_tag.items(), key=lambda x: x[1]['percentage'], reverse=True)
             for tag, stats in sorted_tags:
-                lines.append(f"| {stats['status']} {tag} | {stats['covered']} | {stats['total']} | {stats['percentage']:.1f}% |")
-            lines.append("")
+                writeln(f"| {stats['status']} {tag} | {stats['covered']} | {stats['total']} | {stats['percentage']:.1f}% |")
+            writeln()
 
         # Uncovered endpoints
         if report.uncovered_operations:
-            lines.append(f"## Uncovered Endpoints ({len(report.uncovered_operations)} endpoints)")
-            lines.append("")
-            lines.append("| Operation ID | Method | Path | Tags |")
-            lines.append("|-------------|--------|------|------|")
-            for op in sorted(report.uncovered_operations, key=lambda x: x.operation_id):
+            writeln(f"## Uncovered Endpoints ({len(report.uncovered_operations)} endpoints)")
+            writeln()
+            writeln("| Operation ID | Method | Path | Tags |")
+            writeln("|-------------|--------|------|------|")
+            for op in report.uncovered_operations:
                 tags_str = ", ".join(op.tags) if op.tags else ""
-                lines.append(f"| `{op.operation_id}` | {op.method} | `{op.path}` | {tags_str} |")
-            lines.append("")
+                writeln(f"| `{op.operation_id}` | {op.method} | `{op.path}` | {tags_str} |")
+            writeln()
 
         # Footer
-        lines.append("---")
-        lines.append("")
-        lines.append(f"*Report generated: {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*")
-        lines.append("")
+        writeln("---")
+        writeln()
+        writeln(f"*Report generated: {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*")
 
-        return "\n".join(lines)
+
+# Output format -> (formatter, whether it writes to a sink instead of returning a string)
+FORMATTERS = {
+    'console': (ReportFormatter.format_console, False),
+    'json': (ReportFormatter.format_json, False),
+    'html': (ReportFormatter.format_html_to, True),
+    'markdown': (ReportFormatter.format_markdown_to, True),
+}
 
 
 def main():
@@ -739,7 +868,7 @@ def main():
     )
     parser.add_argument(
         '--format',
-        choices=['console', 'json', 'html', 'markdown'],
+        choices=list(FORMATTERS),
         default='html',
         help='Output format (default: console)'
     )
@@ -781,33 +910,38 @@ def main():
     analyzer = CoverageAnalyzer(operations, operation_tags)
     report = analyzer.analyze()
 
-    # Format report
-    formatter = ReportFormatter()
-    if args.format == 'console':
-        output = formatter.format_console(report, operation_tags)
-    elif args.format == 'json':
-        output = formatter.format_json(report, operation_tags)
-    elif args.format == 'html':
-        output = formatter.format_html(report, operation_tags)
-    elif args.format == 'markdown':
-        output = formatter.format_markdown(report, operation_tags)
+    # Format report; streaming formatters write straight into their output file
+    format_report, is_streaming = FORMATTERS[args.format]
+    output = None if is_streaming else format_report(report, operation_tags)
+
+    def write_report(path: Path) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            if is_streaming:
+                format_report(f, report, operation_tags)
+            else:
+                f.write(output)
 
     # Saves api_coverage.html archive
     if args.save:
-        output = formatter.format_html(report, operation_tags)
         archive_dir.mkdir(parents=True, exist_ok=True)
         output_path_archive = archive_dir / f"api_coverage_{date_time_now}.html"
         output_path = report_dir / "api_coverage.html"
 
-        for path in [output_path, output_path_archive]:
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(output)
+        # Render once, then copy the rendered file into the archive
+        with open(output_path, 'w', encoding='utf-8') as f:
+            ReportFormatter.format_html_to(f, report, operation_tags)
+        shutil.copyfile(output_path, output_path_archive)
 
     if args.output:
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(output)
+        if args.save and args.format == 'html':
+            # --save has already rendered this exact HTML; copy it rather than render again
+            saved_path = report_dir / "api_coverage.html"
+            if output_path.resolve() != saved_path.resolve():
+                shutil.copyfile(saved_path, output_path)
+        else:
+            write_report(output_path)
         print(f"✓ Report saved to: {output_path}", file=sys.stderr)
     else:
         if args.format == 'console':
@@ -815,14 +949,14 @@ def main():
         else:   
             if args.format == 'html':
                 output_path = report_dir / "api_coverage.html"
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(output)
+                # --save has already written this exact file
+                if not args.save:
+                    write_report(output_path)
                         
             else:
                 # For other formats like json, keep the original behavior
                 output_path = script_dir / f"coverage_report.{args.format}"
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(output)
+                write_report(output_path)
 
             print(f"✓ Report saved to: {output_path}", file=sys.stderr)
 
@@ -1,13 +1,28 @@
 import argparse
-import json
 import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+from _routes_common import HTTP_METHODS, load_json, write_json
 
+
+_JSON_CONTENT_TYPES = ("application/json", "application/*+json", "*/*")
+
+_SLUG_SEPARATORS_RE = re.compile(r"[{}:/]+")
+_SLUG_DASHES_RE = re.compile(r"-+")
+# Paths without any of these come out of the two substitutions unchanged
+_SLUG_SPECIAL = frozenset("{}:/-")
+
+# Paths are a small finite set per spec and shared across methods, so cache without bound
+@lru_cache(maxsize=None)
 def slug_from_path(path: str) -> str:
-    slug = re.sub(r"[{}:/]+", "-", path).strip("-")
-    slug = re.sub(r"-+", "-", slug)
+    if not path:
+        return "root"
+    if _SLUG_SPECIAL.isdisjoint(path):
+        return path
+    slug = _SLUG_SEPARATORS_RE.sub("-", path).strip("-")
+    slug = _SLUG_DASHES_RE.sub("-", slug)
     return slug or "root"
 
 def schema_ref_name(schema: Dict[str, Any]) -> Optional[str]:
@@ -33,20 +48,19 @@ def extract_request_body(op: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     if not rb:
         return None
     content = rb.get("content") or {}
-    for ct in ("application/json", "application/*+json", "*/*"):
-        if ct in content:
-            schema = content[ct].get("schema") or {}
-            return {
-                "modelRef": schema_ref_name(schema),
-                "isArray": is_array_schema(schema),
-            }
-    for _ct, v in content.items():
-        schema = v.get("schema") or {}
-        return {
-            "modelRef": schema_ref_name(schema),
-            "isArray": is_array_schema(schema),
-        }
-    return None
+    for ct in _JSON_CONTENT_TYPES:
+        entry = content.get(ct)
+        if entry is not None:
+            break
+    else:
+        entry = next(iter(content.values()), None)
+    if entry is None:
+        return None
+    schema = entry.get("schema") or {}
+    return {
+        "modelRef": schema_ref_name(schema),
+        "isArray": is_array_schema(schema),
+    }
 
 def extract_validations(op: Dict[str, Any]) -> List[Dict[str, Any]]:
     out = []
@@ -58,12 +72,15 @@ def extract_validations(op: Dict[str, Any]) -> List[Dict[str, Any]]:
 
         content = resp.get("content") or {}
         schema = None
-        for ct in ("application/json", "application/*+json", "*/*"):
-            if ct in content:
-                schema = content[ct].get("schema") or {}
+        for ct in _JSON_CONTENT_TYPES:
+            entry = content.get(ct)
+            if entry is not None:
+                schema = entry.get("schema") or {}
                 break
-        if not schema and content:
-            schema = next(iter(content.values())).get("schema") or {}
+        if not schema:
+            first = next(iter(content.values()), None)
+            if first is not None:
+                schema = first.get("schema") or {}
 
         if schema:
             model_ref = schema_ref_name(schema)
@@ -83,9 +100,7 @@ def extract_components_from_parameters(op: Dict[str, Any]) -> Optional[List[Dict
 
 def build_id(method: str, path: str, op: Dict[str, Any]) -> str:
     opid = op.get("operationId")
-    if opid:
-        return f"api-{method.lower()}-{opid}"
-    return f"api-{method.lower()}-{slug_from_path(path)}"
+    return f"api-{method.lower()}-{opid or slug_from_path(path)}"
 
 def normalize_operation(path: str, method: str, op: Dict[str, Any]) -> Dict[str, Any]:
     return {
@@ -105,19 +120,16 @@ def normalize_operation(path: str, method: str, op: Dict[str, Any]) -> Dict[str,
         }
     }
 
-
-HTTP_METHODS = {"get", "put", "post", "delete", "options", "head", "patch", "trace"}
-
 def normalize_openapi(openapi: Dict[str, Any]) -> List[Dict[str, Any]]:
-    results: List[Dict[str, Any]] = []
     paths = openapi.get("paths") or {}
-    for path, path_item in paths.items():
-        if not isinstance(path_item, dict):
-            continue
-        for method, op in path_item.items():
-            if method.lower() in HTTP_METHODS and isinstance(op, dict):
-                results.append(normalize_operation(path, method, op))
-    return results
+    return [
+        normalize_operation(path, m, op)
+        for path, path_item in paths.items() if isinstance(path_item, dict)
+        for method, op in path_item.items() if isinstance(op, dict)
+        # Keys are almost always lowercase already; only lower() the odd ones
+        for m in (method if method in HTTP_METHODS else method.lower(),)
+        if m in HTTP_METHODS
+    ]
 
 def main():
     ap = argparse.ArgumentParser(description="Normalize API schema")
@@ -138,14 +150,12 @@ def main():
 
     args = ap.parse_args()
 
-    data = json.loads(args.input.read_text(encoding="utf-8"))
+    data = load_json(args.input)
     normalized = normalize_openapi(data)
 
-    out = json.dumps(normalized, indent=2, ensure_ascii=False)
-
     args.output.parent.mkdir(parents=True, exist_ok=True)
 
-    args.output.write_text(out, encoding="utf-8")
+    write_json(args.output, normalized)
     print(f"Normalized API schema saved to {args.output}")
 
 if __name__ == "__main__":
@@ -14,18 +14,34 @@ import os
 import sys
 from pathlib import Path
 
+from _routes_common import HTTP_METHODS, loads, write_json
+
 try:
     import httpx
 except ImportError:
     print("Error: httpx is not installed. Please install it with: pip install httpx")
     sys.exit(1)
 
+try:
+    # httpx[http2] extra; plain HTTP/1.1 is used without it
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
 try:
     import yaml
 except ImportError:
     print("Error: pyyaml is not installed. Please install it with: pip install pyyaml")
     sys.exit(1)
 
+try:
+    # libyaml-backed loader, much faster than the pure-Python one on large specs
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+    print("Warning: pyyaml was built without libyaml, YAML schemas will parse slowly", file=sys.stderr)
+
 
 def fetch_openapi_schema(base_url: str, output_path: Path, token: str = None) -> bool:
     """
@@ -49,28 +65,32 @@ def fetch_openapi_schema(base_url: str, output_path: Path, token: str = None) ->
         print(f"Using authentication token")
 
     try:
-        response = httpx.get(schema_url, headers=headers, timeout=30.0, follow_redirects=True)
+        with httpx.Client(http2=_HTTP2, timeout=30.0, follow_redirects=True) as client:
+            response = client.get(schema_url, headers=headers)
         response.raise_for_status()
 
-        # Detect format based on content-type or content
+        # Detect format once based on content-type
         content_type = response.headers.get('content-type', '').lower()
+        body = response.content
 
-        # Try to parse the response (supports both JSON and YAML)
+        # Parse the raw body a single time (supports both JSON and YAML)
         try:
-            # First try JSON
-            if 'json' in content_type:
-                schema = response.json()
-                print(f"  Detected format: JSON")
+            if 'yaml' in content_type:
+                schema, detected = yaml.load(body, Loader=_YamlLoader), "YAML"
+            elif 'json' in content_type:
+                schema, detected = loads(body), "JSON"
             else:
-                # Try YAML (OpenAPI specs are often in YAML)
+                # Unlabelled body: try JSON, then YAML (specs are often served that way)
                 try:
-                    schema = yaml.safe_load(response.text)
-                    print(f"  Detected format: YAML")
-                except yaml.YAMLError:
-                    # Fallback to JSON
-                    schema = response.json()
-                    print(f"  Detected format: JSON")
-        except (json.JSONDecodeError, yaml.YAMLError) as e:
+                    schema, detected = loads(body), "JSON"
+                except json.JSONDecodeError:
+                    schema, detected = yaml.load(body, Loader=_YamlLoader), "YAML"
+
+            # YAML happily parses an error page into a plain string; never save one
+            if not isinstance(schema, dict):
+                raise ValueError(f"expected a JSON/YAML object, got {type(schema).__name__}")
+            print(f"  Detected format: {detected}")
+        except (ValueError, yaml.YAMLError) as e:
             print(f"✗ Failed to parse response: {e}", file=sys.stderr)
             print(f"\nResponse details:", file=sys.stderr)
             print(f"  - Status code: {response.status_code}", file=sys.stderr)
@@ -92,16 +112,15 @@ def fetch_openapi_schema(base_url: str, output_path: Path, token: str = None) ->
         # Ensure output directory exists
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Save schema to file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(schema, f, indent=2, ensure_ascii=False)
+        # Save schema to file (via a temp file swapped in atomically)
+        write_json(output_path, schema)
 
-        # Print summary
-        paths_count = len(schema.get('paths', {}))
-        operations_count = sum(
-            len([k for k in methods.keys() if k in ['get', 'post', 'put', 'patch', 'delete']])
-            for methods in schema.get('paths', {}).values()
-        )
+        # Print summary (paths and operations counted in one pass)
+        paths_count = 0
+        operations_count = 0
+        for methods in schema.get('paths', {}).values():
+            paths_count += 1
+            operations_count += sum(1 for k in methods if k in HTTP_METHODS)
 
         print(f"✓ Schema saved to: {output_path}")
         print(f"  - OpenAPI version: {schema.get('openapi', 'unknown')}")
@@ -1,7 +1,19 @@
 import re
-import json
+from html import escape as _esc
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Union
+
+from _routes_common import atomic_write_bytes, write_json
+
+try:
+    import tree_sitter_typescript
+    from tree_sitter import Language, Parser
+    # Built once; Parser(Language(ptr)) is the tree-sitter >= 0.22 API and older
+    # releases (e.g. 0.21, paired with tree_sitter_languages) raise TypeError here
+    _TS_PARSER = Parser(Language(tree_sitter_typescript.language_typescript()))
+except (ImportError, TypeError, ValueError):
+    tree_sitter_typescript = None
+    _TS_PARSER = None
 
 """"
 Usage:
@@ -10,38 +22,71 @@ default path to fetch routes: /routes/routes.ts
 default output path: /routes/docs/routes_openapi_schema.json
 default HTML output path: /routes/ui_routes.html
 """
-def generate_html_doc(schema: Dict[str, Any]) -> str:
-    title = schema.get("info", {}).get("title", "Routes Documentation")
-    paths = schema.get("paths", {})
 
-    html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
-    <style>
-        body {{ 
+# Line comments (matched only to be skipped), static routes (key: 'path')
+# or function routes with TS types (key: (params) => `template`)
+_ROUTE_RE = re.compile(
+    r'//[^\n]*'
+    r'|(?P<skey>\w+):\s*[\'"](?P<sval>[^\'"]+)[\'"]'
+    r'|(?P<fkey>\w+):\s*\((?P<fparams>[^)]*)\)\s*=>\s*`(?P<ftmpl>[^`]+)`',
+    re.DOTALL,
+)
+# Match param name, optional flag, and type
+_PARAM_TYPE_RE = re.compile(r'(\w+)(\??):\s*([\w\[\]|]+)')
+_TEMPLATE_VAR_RE = re.compile(r"\$\{(\w+)\}")
+# ${name} template vars and [name] route segments, both rewritten to {name}
+_PATH_NORMALIZE_RE = re.compile(r"\$\{(\w+)\}|\[(\w+)\]")
+_PATH_VAR_RE = re.compile(r"\{(\w+)\}")
+# One '&'-separated query token; "key" is the text before its first '='
+_QUERY_TOKEN_RE = re.compile(r"(?P<key>[^&=]*)[^&]*")
+
+def _to_path_param(m: re.Match) -> str:
+    return "{" + (m.group(1) or m.group(2)) + "}"
+
+def _normalize_path(raw_path: str) -> str:
+    """Rewrite ${name} / [name] placeholders to {name} and drop a trailing slash."""
+    path = raw_path
+    # Most routes have neither marker; two substring checks are far cheaper than a regex pass
+    if "$" in path or "[" in path:
+        path = _PATH_NORMALIZE_RE.sub(_to_path_param, path)
+    if path != "/" and path.endswith("/"):
+        path = path[:-1]
+    return path
+
+_TS_TO_OPENAPI = {
+    "string": "string",
+    "number": "number",
+    "boolean": "boolean",
+    "any": "object",
+    "Date": "string"
+}
+
+# Fallbacks for placeholders with no typed signature; shared, never mutated
+_DEFAULT_PATH_PARAM = {"type": "string", "required": True}
+_DEFAULT_QUERY_PARAM = {"type": "string", "required": False}
+
+# Static stylesheet for the routes page, kept out of the per-call template
+_CSS = """
+        body { 
             font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
             margin: 0;
             padding: 20px;
             background-color: #fdfdfd;
             color: #333;
-        }}
-        h1 {{ 
+        }
+        h1 { 
             color: #222; 
             border-bottom: 2px solid #eee;
             padding-bottom: 10px;
-        }}
-        .route-block {{
+        }
+        .route-block {
             margin-bottom: 30px;
             border: 1px solid #eee;
             border-radius: 8px;
             overflow: hidden;
             box-shadow: 0 2px 5px rgba(0,0,0,0.05);
-        }}
-        h2.path {{ 
+        }
+        h2.path { 
             background-color: #f7f7f7; 
             padding: 12px 20px; 
             margin: 0;
@@ -49,61 +94,77 @@ def generate_html_doc(schema: Dict[str, Any]) -> str:
             color: #007bff; /* Blue for the path */
             font-size: 1.2em;
             word-break: break-all;
-        }}
-        table {{ 
+        }
+        table { 
             width: 100%; 
             border-collapse: collapse; 
-        }}
-        th, td {{ 
+        }
+        th, td { 
             border-top: 1px solid #eee; 
             padding: 12px 20px; 
             text-align: left; 
             vertical-align: top;
-        }}
-        th {{ 
+        }
+        th { 
             background-color: #fcfcfc;
             font-weight: 600;
             color: #555;
             width: 20%;
-        }}
-        td:first-child {{
+        }
+        td:first-child {
             font-family: 'Courier New', Courier, monospace;
             color: #d63384; /* Pinkish for param name */
             font-weight: bold;
-        }}
-        .no-params {{
+        }
+        .no-params {
             padding: 12px 20px;
             color: #777;
-        }}
-        .required-true {{
+        }
+        .required-true {
             font-weight: bold;
             color: #c00;
-        }}
-        .required-false {{
+        }
+        .required-false {
             color: #555;
-        }}
-    </style>
+        }
+"""
+
+# Page head; filled in with str.format(title=..., css=_CSS)
+_HTML_HEAD = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <style>{css}    </style>
 </head>
 <body>
     <h1>{title}</h1>
     """
 
+def generate_html_doc(schema: Dict[str, Any]) -> str:
+    title = schema.get("info", {}).get("title", "Routes Documentation")
+    paths = schema.get("paths", {})
+
+    parts = [_HTML_HEAD.format(title=_esc(title), css=_CSS)]
+
     if not paths:
-        html += "<p>No paths found.</p>"
+        parts.append("<p>No paths found.</p>")
     
     # Sort paths for consistent order
     sorted_paths = sorted(paths.items())
 
     for path, entry in sorted_paths:
-        html += '<div class="route-block">'
-        html += f'<h2 class="path"><code>{path}</code></h2>'
+        parts.append('<div class="route-block">')
+        parts.append(f'<h2 class="path"><code>{_esc(path)}</code></h2>')
         
         parameters = entry.get("parameters", [])
         
         if not parameters:
-            html += '<div class="no-params">No parameters.</div>'
+            parts.append('<div class="no-params">No parameters.</div>')
         else:
-            html += """
+            parts.append("""
             <table>
                 <thead>
                     <tr>
@@ -114,7 +175,7 @@ def generate_html_doc(schema: Dict[str, Any]) -> str:
                     </tr>
                 </thead>
                 <tbody>
-            """
+            """)
             
             for param in parameters:
                 name = param.get("name", "N/A")
@@ -124,102 +185,161 @@ def generate_html_doc(schema: Dict[str, Any]) -> str:
                 
                 required_class = "required-true" if required else "required-false"
                 
-                html += f"""
+                parts.append(f"""
                     <tr>
-                        <td><code>{name}</code></td>
-                        <td>{location}</td>
+                        <td><code>{_esc(name)}</code></td>
+                        <td>{_esc(location)}</td>
                         <td><span class="{required_class}">{required}</span></td>
-                        <td>{param_type}</td>
+                        <td>{_esc(param_type)}</td>
                     </tr>
-                """
+                """)
                 
-            html += """
+            parts.append("""
                 </tbody>
             </table>
-            """
+            """)
         
-        html += '</div>' # end .route-block
+        parts.append('</div>') # end .route-block
 
     # Close HTML
-    html += """
+    parts.append("""
 </body>
 </html>
-    """
-    return html
+    """)
+    return "".join(parts)
 
-def extract_routes(ts_text: str):
+def extract_routes(ts_text: Union[str, bytes]):
     """
     Extract key-value pairs and function definitions from a TS export object.
     Returns a dict mapping route name -> {"path": path_template, "params": {paramName: {"type": str, "required": bool}}}.
+    Uses the tree-sitter TypeScript grammar when a compatible tree-sitter is installed,
+    the regex scanner otherwise.
+    Accepts the source as str or as UTF-8 bytes.
     """
-    routes = {}
+    if _TS_PARSER is not None:
+        return _extract_routes_ast(ts_text)
+    return _extract_routes_regex(ts_text)
+
+
+def _extract_routes_ast(ts_text: Union[str, bytes]):
+    # tree-sitter parses bytes, so raw file contents need no decode/encode round trip
+    src = ts_text.encode("utf-8") if isinstance(ts_text, str) else ts_text
+    root = _TS_PARSER.parse(src).root_node
+
+    def text(node) -> str:
+        return src[node.start_byte:node.end_byte].decode("utf-8")
+
+    static_routes = {}
+    func_routes = {}
+
+    # Pre-order walk so routes keep their source order
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        stack.extend(reversed(node.named_children))
+        if node.type != "pair":
+            continue
+        key = node.child_by_field_name("key")
+        value = node.child_by_field_name("value")
+        if key is None or value is None or key.type != "property_identifier":
+            continue
 
-    # Remove comments
-    ts_text = re.sub(r"//.*", "", ts_text)
+        if value.type == "string":
+            path = text(value)[1:-1]
+            if path:
+                static_routes[text(key)] = {"path": path, "params": {}}
+            continue
 
-    # Static routes
-    for key, value in re.findall(r'(\w+):\s*[\'"]([^\'"]+)[\'"]', ts_text):
-        routes[key] = {"path": value, "params": {}}
+        if value.type != "arrow_function":
+            continue
+        body = value.child_by_field_name("body")
+        params = value.child_by_field_name("parameters")
+        if body is None or body.type != "template_string" or params is None:
+            continue
 
-    # Function routes with TS types
-    func_pattern = re.compile(r'(\w+):\s*\(([^)]*)\)\s*=>\s*`([^`]+)`', re.DOTALL)
-    for key, params_str, template in func_pattern.findall(ts_text):
         param_types = {}
-        # Match param name, optional flag, and type
-        for match in re.findall(r'(\w+)(\??):\s*([\w\[\]|]+)', params_str):
-            param_name, optional, ts_type = match
+        for param in params.named_children:
+            pattern = param.child_by_field_name("pattern")
+            annotation = param.child_by_field_name("type")
+            if pattern is None or annotation is None:
+                continue
+            param_types[text(pattern)] = {
+                # Leading type token only, as the regex scanner reports it
+                "type": text(annotation).lstrip(":").split(None, 1)[0],
+                "required": param.type != "optional_parameter"
+            }
+
+        route = _TEMPLATE_VAR_RE.sub(r"{\1}", text(body)[1:-1])
+        func_routes[text(key)] = {"path": route, "params": param_types}
+
+    # Static routes first, function routes override on duplicate keys
+    return {**static_routes, **func_routes}
+
+
+def _extract_routes_regex(ts_text: Union[str, bytes]):
+    if isinstance(ts_text, bytes):
+        ts_text = ts_text.decode("utf-8")
+
+    static_routes = {}
+    func_routes = {}
+
+    # Single scan for both route kinds; comments are consumed by the scan itself
+    for m in _ROUTE_RE.finditer(ts_text):
+        if m["skey"] is not None:
+            static_routes[m["skey"]] = {"path": m["sval"], "params": {}}
+            continue
+        if m["fkey"] is None:
+            continue
+
+        param_types = {}
+        for pm in _PARAM_TYPE_RE.finditer(m["fparams"]):
+            param_name, optional, ts_type = pm.groups()
             param_types[param_name] = {
                 "type": ts_type.strip(),
                 "required": optional != "?"
             }
 
-        route = re.sub(r"\$\{(\w+)\}", r"{\1}", template)
-        routes[key] = {"path": route, "params": param_types}
+        route = _TEMPLATE_VAR_RE.sub(r"{\1}", m["ftmpl"])
+        func_routes[m["fkey"]] = {"path": route, "params": param_types}
 
-    return routes
+    # Static routes first, function routes override on duplicate keys
+    return {**static_routes, **func_routes}
 
 
 def ts_type_to_openapi(ts_type: str) -> str:
-    mapping = {
-        "string": "string",
-        "number": "number",
-        "boolean": "boolean",
-        "any": "object",
-        "Date": "string"
-    }
-    return mapping.get(ts_type, "string")
+    return _TS_TO_OPENAPI.get(ts_type, "string")
 
 
 def extract_params(path: str, params: dict):
-    found_params = re.findall(r"\{(\w+)\}", path)
     parameters = []
-    for p in found_params:
-        ts_info = params.get(p, {"type": "string", "required": True})
+    for p in _PATH_VAR_RE.findall(path):
+        ts_info = params.get(p, _DEFAULT_PATH_PARAM)
         parameters.append({
             "name": p,
             "in": "path",
             "required": ts_info.get("required", True),
-            "schema": {"type": ts_type_to_openapi(ts_info.get("type", "string"))}
+            "schema": {"type": _TS_TO_OPENAPI.get(ts_info.get("type", "string"), "string")}
         })
     return parameters
 
 
 def extract_query_params(path: str, params: dict):
     query_params = []
-    if "?" in path:
-        query = path.split("?", 1)[1]
-        for q in query.split("&"):
-            key = q.split("=")[0]
-            match = re.search(r"\$\{(\w+)\}", q)
+    qpos = path.find("?")
+    if qpos >= 0:
+        for m in _QUERY_TOKEN_RE.finditer(path, qpos + 1):
+            key = m["key"]
+            if not key:
+                continue
+            match = _TEMPLATE_VAR_RE.search(path, m.start(), m.end())
             var_name = match.group(1) if match else None
-            ts_info = params.get(var_name, {"type": "string", "required": False})
-            if key:
-                query_params.append({
-                    "name": key,
-                    "in": "query",
-                    "required": ts_info.get("required", False),
-                    "schema": {"type": ts_type_to_openapi(ts_info.get("type", "string"))}
-                })
+            ts_info = params.get(var_name, _DEFAULT_QUERY_PARAM)
+            query_params.append({
+                "name": key,
+                "in": "query",
+                "required": ts_info.get("required", False),
+                "schema": {"type": _TS_TO_OPENAPI.get(ts_info.get("type", "string"), "string")}
+            })
     return query_params
 
 def generate_routes_doc():
@@ -231,24 +351,15 @@ def generate_routes_doc():
         print(f"Routes file not found in: {input_path}")
         return
 
-    ts_text = input_path.read_text(encoding="utf-8")
-    routes = extract_routes(ts_text)
+    routes = extract_routes(input_path.read_bytes())
 
     paths = {}
     for key, info in routes.items():
-        raw_path = info["path"]
+        path = _normalize_path(info["path"])
         params = info["params"]
 
-        path = re.sub(r"\$\{(\w+)\}", r"{\1}", raw_path)
-        path = re.sub(r"\[(\w+)\]", r"{\1}", path)
-        if path != "/" and path.endswith("/"):
-            path = path[:-1]
-
         all_params = extract_params(path, params) + extract_query_params(path, params)
-        entry = {}
-        if all_params:
-            entry["parameters"] = all_params
-        paths[path] = entry
+        paths[path] = {"parameters": all_params} if all_params else {}
 
     routes_openapi_schema = {
         "openapi": "3.1.0",
@@ -257,10 +368,10 @@ def generate_routes_doc():
     }
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(routes_openapi_schema, indent=2, ensure_ascii=False))
+    write_json(output_path, routes_openapi_schema)
 
     html_content = generate_html_doc(routes_openapi_schema)
-    html_output_path.write_text(html_content, encoding="utf-8")
+    atomic_write_bytes(html_output_path, html_content.encode("utf-8"))
     print(f"UI routes HTML saved to: {html_output_path}")
 
     print(f"UI routes documentation saved to: {output_path}")
@@ -1,103 +1,139 @@
-import json
 import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+from _routes_common import load_json, write_json
 
-def load_json(path: Path) -> Dict[str, Any]:
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+# Constant-shape templates for each feature; copying them beats rebuilding the literals
+_SPEC_PROTO: Dict[str, Any] = {
+    "route": None,
+    "path": None,
+    "method": None,
+    "operationId": None,
+    "components": None,
+}
+_FEATURE_PROTO: Dict[str, Any] = {
+    "id": None,
+    "featureType": "uiPage",
+    "description": "",
+    "tags": None,
+    "spec": None,
+}
 
+# Below this many routes the process pool costs more than it saves
+_PARALLEL_MIN_ROUTES = 1000
 
-def build_base_from_route(route: str) -> (str, Optional[str], List[str]):
-    if route == "/":
-        return "root", None, []
-
-    if "?" in route:
-        path_part, query_part = route.split("?", 1)
-    else:
-        path_part, query_part = route, None
-
-    segments = [s for s in path_part.split("/") if s]
-    base = "_".join(segments) if segments else "root"
 
-    return base, query_part, segments
+def _decompose(route: str) -> Tuple[Optional[str], Tuple[str, ...]]:
+    """Split a route once into its query string (None if absent) and non-empty path segments."""
+    path_part, sep, query_part = route.partition("?")
+    segments = tuple(filter(None, path_part.split("/")))
+    return (query_part if sep else None), segments
 
 
-def build_id(route: str) -> str:
-    if route == "/":
-        return "ui_root"
+def _base(segments: Sequence[str]) -> str:
+    return "_".join(segments) if segments else "root"
 
-    path_part = route.split("?", 1)[0]
-    segments = [s for s in path_part.split("/") if s]
 
+def _id_from_segments(segments: Tuple[str, ...]) -> str:
     literal_segments = [
         s for s in segments
         if not (s.startswith("{") and s.endswith("}"))
     ]
-
-    if not literal_segments:
-        base = "root"
-    else:
-        base = "_".join(literal_segments)
-
-    return f"ui_{base}"
+    return f"ui_{_base(literal_segments)}"
 
 
-def build_operation_id(route: str) -> str:
-    base, query_part, _ = build_base_from_route(route)
+def _operation_id_from_parts(query_part: Optional[str], segments: Tuple[str, ...]) -> str:
+    base = _base(segments)
     if query_part is not None:
         return f"{base}_?{query_part}"
     return base
 
 
-def build_tags(route: str) -> List[str]:
+def _tags_from_segments(segments: Tuple[str, ...]) -> List[str]:
+    # One tag for shallow routes, the first two segments otherwise
+    return list(segments[:1] if len(segments) < 3 else segments[:2])
+
+
+def build_base_from_route(route: str) -> (str, Optional[str], List[str]):
     if route == "/":
-        return []
+        return "root", None, []
+
+    query_part, segments = _decompose(route)
+    return _base(segments), query_part, list(segments)
 
-    path_part = route.split("?", 1)[0]
-    segments = [s for s in path_part.split("/") if s]
 
-    if len(segments) == 0:
+def build_id(route: str) -> str:
+    if route == "/":
+        return "ui_root"
+
+    return _id_from_segments(_decompose(route)[1])
+
+
+def build_operation_id(route: str) -> str:
+    return _operation_id_from_parts(*_decompose(route))
+
+
+def build_tags(route: str) -> List[str]:
+    if route == "/":
         return []
-    if len(segments) == 1:
-        return [segments[0]]
-    if len(segments) == 2:
-        return [segments[0]]
-    return [segments[0], segments[1]]
 
+    return _tags_from_segments(_decompose(route)[1])
 
-def normalize_routes_doc(doc: Dict[str, Any]) -> Dict[str, Any]:
-    paths = doc.get("paths", {})
+
+def _normalize_chunk(items: List[Tuple[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Build the feature dicts for a run of (route, path_item) pairs.
+    Kept at module level so it can be pickled into ProcessPoolExecutor workers.
+    """
     features: List[Dict[str, Any]] = []
 
-    for route, path_item in sorted(paths.items(), key=lambda kv: kv[0]):
+    for route, path_item in items:
         if not isinstance(path_item, dict):
             path_item = {}
 
-        feature_id = build_id(route)
-        operation_id = build_operation_id(route)
-        tags = build_tags(route)
+        # Split each route once and derive id, operationId and tags from the pieces
+        query_part, segments = _decompose(route)
+        feature_id = _id_from_segments(segments)
+        operation_id = _operation_id_from_parts(query_part, segments)
+        tags = _tags_from_segments(segments)
 
         parameters = path_item.get("parameters")
         components = parameters if isinstance(parameters, list) else None
 
-        feature = {
-            "id": feature_id,
-            "featureType": "uiPage",
-            "description": "",
-            "tags": tags,
-            "spec": {
-                "route": route,
-                "path": None,
-                "method": None,
-                "operationId": operation_id,
-                "components": components,
-            },
-        }
+        spec = _SPEC_PROTO.copy()
+        spec["route"] = route
+        spec["operationId"] = operation_id
+        spec["components"] = components
+
+        feature = _FEATURE_PROTO.copy()
+        feature["id"] = feature_id
+        feature["tags"] = tags
+        feature["spec"] = spec
 
         features.append(feature)
 
+    return features
+
+
+def normalize_routes_doc(doc: Dict[str, Any]) -> Dict[str, Any]:
+    # Route keys are unique, so plain tuple ordering sorts by route alone
+    items = sorted(doc.get("paths", {}).items())
+    workers = os.cpu_count() or 1
+
+    if len(items) < _PARALLEL_MIN_ROUTES or workers < 2:
+        return {"features": _normalize_chunk(items)}
+
+    # Contiguous shards keep the sorted order when the results are concatenated
+    size = -(-len(items) // workers)
+    shards = [items[i:i + size] for i in range(0, len(items), size)]
+    features: List[Dict[str, Any]] = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for part in executor.map(_normalize_chunk, shards):
+            features.extend(part)
+
     return {"features": features}
 
 
@@ -127,9 +163,8 @@ def main() -> None:
 
     args.output.parent.mkdir(parents=True, exist_ok=True)
 
-    with args.output.open("w", encoding="utf-8") as f:
-        json.dump(normalized, f, ensure_ascii=False, indent=2)
-        print(f"Normalized UI routes schema saved to {args.output}")
+    write_json(args.output, normalized)
+    print(f"Normalized UI routes schema saved to {args.output}")
 
 
 